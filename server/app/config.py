@@ -11,19 +11,37 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     fal_key: str = ""
 
+    # OpenAI models. Creative rewriting (clean_prompt, 3D preview) keeps the
+    # flagship model; intent parsing and short answers run on the mini model.
+    openai_prompt_model: str = "gpt-4o"
+    openai_intent_model: str = "gpt-4o-mini"
+    openai_answer_model: str = "gpt-4o-mini"
+
     # Server
     host: str = "0.0.0.0"
     port: int = int(os.environ.get("PORT", 8000))
+    # Worker processes. Keep at 1 without Redis: in-memory jobs are per-process
+    workers: int = int(os.environ.get("WEB_CONCURRENCY", 1))
     debug: bool = False
+    log_level: str = "INFO"
 
     # Redis (optional - falls back to in-memory if not set)
     redis_url: str = ""
 
+    # Semantic response cache for deterministic OpenAI calls
+    semantic_cache_enabled: bool = True
+    semantic_cache_max_entries: int = 2048
+    semantic_cache_ttl: int = 600  # 10 minutes
+    semantic_cache_threshold: float = 0.95  # Minimum cosine similarity for a hit
+
     # Directories
     upload_dir: Path = Path("uploads")
     output_dir: Path = Path("outputs")
     cache_dir: Path = Path("cache")
 
+    # Largest accepted request body (image uploads)
+    max_upload_bytes: int = 20 * 1024 * 1024  # 20 MB
+
     # CORS
     cors_origins: list[str] = [
         "http://localhost:3000",
@@ -32,6 +50,12 @@ class Settings(BaseSettings):
         "https://www.arcki.tech",
     ]
 
+    # DALL-E throttling (match your OpenAI tier's images RPM). Both are totals
+    # for the account and are split evenly across the `workers` processes; the
+    # concurrency share is at least 1 per worker
+    dalle_requests_per_minute: int = 7
+    dalle_max_concurrent: int = 4
+
     # Generation defaults - optimized for quality
     default_texture_size: int = 1024 # Max resolution
     default_mesh_simplify: float = 0.95  # 0.9 = max detail (minimum simplification)
@@ -0,0 +1,57 @@
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Responses passed through uncompressed: SSE must reach the client event by
+# event (gzip buffers it), and GLBs carry already-compressed textures
+UNCOMPRESSED_TYPES = ("text/event-stream", "model/gltf-binary")
+
+
+class _SelectiveGZipResponder(GZipResponder):
+    async def send_with_gzip(self, message: Message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(UNCOMPRESSED_TYPES):
+                # Same pass-through GZipResponder uses for pre-encoded bodies
+                self.content_encoding_set = True
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves streaming and binary model responses alone."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("Accept-Encoding", ""):
+                responder = _SelectiveGZipResponder(
+                    self.app, self.minimum_size, compresslevel=self.compresslevel
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class ContentLengthLimitMiddleware:
+    """
+    Reject requests whose declared Content-Length exceeds max_bytes with a 413
+    before any of the body is received. Bodies without a Content-Length are
+    left to the route to limit while reading.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            content_length = Headers(scope=scope).get("content-length", "")
+            if content_length.isdigit() and int(content_length) > self.max_bytes:
+                response = JSONResponse(
+                    {"detail": f"Request body exceeds {self.max_bytes} bytes"},
+                    status_code=413
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -1,4 +1,15 @@
+import os
+import contextlib
+import re
+import stat
 import uuid
+import asyncio
+import hashlib
+import functools
+from pathlib import Path
+from typing import Optional
+import aiofiles
+import orjson
 from fastapi import APIRouter, File, UploadFile, HTTPException
 from fastapi.responses import FileResponse
 
@@ -8,6 +19,50 @@ from ..schemas import UploadResponse
 
 router = APIRouter(tags=["Files"])
 
+# Uploads are copied to disk in chunks of this size instead of read whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Raster formats fal.ai Trellis accepts
+ALLOWED_IMAGE_TYPES = frozenset({
+    "image/png",
+    "image/jpeg",
+    "image/webp",
+    "image/gif",
+    "image/avif",
+})
+
+
+def _is_allowed_image(head: bytes) -> bool:
+    """Check the leading bytes of an upload against the allowed formats' signatures."""
+    # The declared Content-Type is client-controlled; the file's own magic
+    # bytes decide what actually gets sent to fal
+    return (
+        head.startswith((b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n", b"GIF87a", b"GIF89a"))
+        or (head[:4] == b"RIFF" and head[8:12] == b"WEBP")
+        or head[4:12] in (b"ftypavif", b"ftypavis")
+    )
+
+
+# Anything outside this set is replaced in client-supplied filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _safe_filename(filename: Optional[str]) -> str:
+    """Reduce a client-supplied filename to a safe basename for the cache dir."""
+    # String ops only: drop any directory part (either separator), then unsafe
+    # characters and leading dots so the result can't escape or hide
+    base = (filename or "").rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
+    base = _UNSAFE_FILENAME_CHARS.sub("_", base).lstrip(".")
+    return base[-100:] or "upload"
+
+
+class MeshFileResponse(FileResponse):
+    """
+    FileResponse that reads in 1 MiB chunks instead of Starlette's 64 KiB, so a
+    multi-MB GLB takes a handful of threadpool reads and ASGI sends, not hundreds.
+    """
+    chunk_size = 1024 * 1024
+
 
 @router.post("/upload-and-generate", response_model=UploadResponse)
 async def upload_and_generate(file: UploadFile = File(...)):
@@ -15,47 +70,151 @@ async def upload_and_generate(file: UploadFile = File(...)):
     Upload an image and generate 3D model directly.
     Useful for existing architectural images.
     """
-    if not file.content_type or not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="File must be an image")
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(status_code=400, detail="File must be a PNG, JPEG, WebP, GIF or AVIF image")
 
     fal_svc = FalService()
     if not fal_svc.is_configured:
         raise HTTPException(status_code=503, detail="fal.ai not configured")
 
     try:
-        content = await file.read()
-        filename = f"{uuid.uuid4().hex}_{file.filename}"
-
-        # Upload to fal storage
-        image_url = await fal_svc.upload_image(content, filename)
-
-        # Generate 3D
-        result = await fal_svc.generate_3d(image_url=image_url)
-
-        return UploadResponse(
-            status="success",
-            input_file=file.filename or "unknown",
-            model_url=result.model_url,
-            model_file=result.file_name,
-            download_url=f"/download/{result.file_name}",
-            format="glb",
-            generation_time=result.generation_time
-        )
+        settings = get_settings()
+        # Unique prefix so concurrent uploads of the same name never collide
+        filename = f"{uuid.uuid4().hex}_{_safe_filename(file.filename)}"
+        local_path = settings.cache_dir / filename
+
+        # Stream the upload to disk so large images are never held in memory,
+        # hashing it on the way through
+        hasher = hashlib.blake2b(digest_size=16)
+        size = 0
+        # Sniff the first chunk before anything is written, so a mislabelled
+        # file is rejected here rather than by fal after the upload
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not _is_allowed_image(chunk):
+            raise HTTPException(status_code=415, detail="File content is not a PNG, JPEG, WebP, GIF or AVIF image")
+        async with aiofiles.open(local_path, "wb") as out:
+            while chunk:
+                # Uploads without a Content-Length get past the middleware check
+                size += len(chunk)
+                if size > settings.max_upload_bytes:
+                    break
+                hasher.update(chunk)
+                await out.write(chunk)
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if size > settings.max_upload_bytes:
+            await asyncio.to_thread(local_path.unlink)
+            raise HTTPException(status_code=413, detail=f"File exceeds {settings.max_upload_bytes} bytes")
+        content_hash = hasher.hexdigest()
+
+        # Re-uploads of the same image reuse its mesh while the GLB is still on disk
+        cached = await _read_cached_mesh(content_hash)
+        if cached:
+            await asyncio.to_thread(local_path.unlink)
+            cached["input_file"] = file.filename or "unknown"
+            return UploadResponse(**cached)
+
+        # Concurrent uploads of the same image share one generation
+        task = _inflight_meshes.get(content_hash)
+        if task is None:
+            task = asyncio.create_task(_generate_mesh(fal_svc, local_path, content_hash))
+            _inflight_meshes[content_hash] = task
+            task.add_done_callback(functools.partial(_finish_inflight_mesh, content_hash))
+        else:
+            await asyncio.to_thread(local_path.unlink)
+
+        # Shielded so one client disconnecting doesn't cancel it for the others
+        response = await asyncio.shield(task)
+        return response.model_copy(update={"input_file": file.filename or "unknown"})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Mesh generations in progress in this worker, keyed by image hash
+_inflight_meshes: dict[str, asyncio.Task[UploadResponse]] = {}
+
+
+def _finish_inflight_mesh(content_hash: str, task: asyncio.Task[UploadResponse]) -> None:
+    """Drop a finished generation from the in-flight map."""
+    if _inflight_meshes.get(content_hash) is task:
+        del _inflight_meshes[content_hash]
+    if not task.cancelled():
+        # Retrieve the exception so it isn't logged as never retrieved when
+        # every waiting request was cancelled; each waiter still sees it
+        task.exception()
+
+
+async def _generate_mesh(fal_svc: FalService, local_path: Path, content_hash: str) -> UploadResponse:
+    """Generate a GLB from an uploaded image and record it in the mesh cache."""
+    # Upload to fal storage
+    image_url = await fal_svc.upload_file(local_path)
+
+    # Generate 3D
+    result = await fal_svc.generate_3d(image_url=image_url)
+
+    response = UploadResponse(
+        status="success",
+        input_file=local_path.name,
+        model_url=result.model_url,
+        model_file=result.file_name,
+        download_url=f"/download/{result.file_name}",
+        format="glb",
+        generation_time=result.generation_time
+    )
+    await _write_cached_mesh(content_hash, response)
+    return response
+
+
+# Upload mesh cache: one JSON record per image hash next to the cached uploads.
+# It lives on disk rather than in worker memory so every uvicorn worker on the
+# machine sees it, and /cleanup clears it along with the GLBs it points to.
+
+def _mesh_record_path(content_hash: str) -> Path:
+    return get_settings().cache_dir / f"mesh_{content_hash}.json"
+
+
+async def _read_cached_mesh(content_hash: str) -> Optional[dict]:
+    """Get the stored upload response for an image hash if its GLB still exists."""
+    try:
+        async with aiofiles.open(_mesh_record_path(content_hash), "rb") as f:
+            record = orjson.loads(await f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+
+    glb_path = get_settings().output_dir / record["model_file"]
+    if not await asyncio.to_thread(glb_path.is_file):
+        return None
+    return record
+
+
+async def _write_cached_mesh(content_hash: str, response: UploadResponse) -> None:
+    """Store an upload response for an image hash, atomically for other workers."""
+    record_path = _mesh_record_path(content_hash)
+    tmp_path = record_path.with_name(f".{uuid.uuid4().hex}.part")
+    async with aiofiles.open(tmp_path, "wb") as f:
+        await f.write(orjson.dumps(response.model_dump()))
+    await asyncio.to_thread(os.replace, tmp_path, record_path)
+
+
 @router.get("/download/{filename}")
 async def download_mesh(filename: str):
     """Download generated GLB file."""
     settings = get_settings()
     file_path = settings.output_dir / filename
 
-    if not file_path.exists():
+    # Stat once off the event loop and hand the result to FileResponse so it
+    # doesn't stat again; the body is then streamed straight from the path
+    try:
+        stat_result = await asyncio.to_thread(os.stat, file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    if not stat.S_ISREG(stat_result.st_mode):
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(
-        path=str(file_path),
+    return MeshFileResponse(
+        path=file_path,
+        stat_result=stat_result,
         media_type="model/gltf-binary",
         filename=filename,
         headers={"Content-Disposition": f"attachment; filename={filename}"}
@@ -68,11 +227,22 @@ async def cleanup_files():
     settings = get_settings()
 
     try:
-        for directory in [settings.upload_dir, settings.output_dir, settings.cache_dir]:
-            for file in directory.glob("*"):
-                if file.is_file():
-                    file.unlink()
+        # Each directory is cleared in its own worker thread
+        await asyncio.gather(*[
+            asyncio.to_thread(_remove_files, directory)
+            for directory in [settings.upload_dir, settings.output_dir, settings.cache_dir]
+        ])
 
         return {"status": "success", "message": "All files cleaned up"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _remove_files(directory: Path) -> None:
+    """Delete the regular files directly inside a directory."""
+    # scandir yields cached d_type, so no extra stat per entry like glob + is_file.
+    # A missing directory has nothing to clean up
+    with contextlib.suppress(FileNotFoundError), os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                os.unlink(entry.path)
@@ -1,6 +1,8 @@
 import time
 import uuid
+import orjson
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from ..services import OpenAIService, FalService, get_job_store
 from ..schemas import (
@@ -36,64 +38,64 @@ JOB_TTL = 7200
 # Job Storage Helpers
 # =============================================================================
 
-def get_pipeline_job(job_id: str) -> JobStatus | None:
+async def get_pipeline_job(job_id: str) -> JobStatus | None:
     """Get a pipeline job from storage."""
     store = get_job_store()
-    data = store.get(PREFIX_PIPELINE, job_id)
+    data = await store.get(PREFIX_PIPELINE, job_id)
     if data:
         return JobStatus(**data)
     return None
 
 
-def set_pipeline_job(job: JobStatus) -> None:
+async def set_pipeline_job(job: JobStatus) -> None:
     """Store a pipeline job."""
     store = get_job_store()
-    store.set(PREFIX_PIPELINE, job.job_id, job.model_dump(), JOB_TTL)
+    await store.set(PREFIX_PIPELINE, job.job_id, job.model_dump(), JOB_TTL)
 
 
-def get_3d_job(job_id: str) -> ThreeDJobStatus | None:
+async def get_3d_job(job_id: str) -> ThreeDJobStatus | None:
     """Get a 3D job from storage."""
     store = get_job_store()
-    data = store.get(PREFIX_3D, job_id)
+    data = await store.get(PREFIX_3D, job_id)
     if data:
         return ThreeDJobStatus(**data)
     return None
 
 
-def set_3d_job(job: ThreeDJobStatus) -> None:
+async def set_3d_job(job: ThreeDJobStatus) -> None:
     """Store a 3D job."""
     store = get_job_store()
-    store.set(PREFIX_3D, job.job_id, job.model_dump(), JOB_TTL)
+    await store.set(PREFIX_3D, job.job_id, job.model_dump(), JOB_TTL)
 
 
-def delete_3d_job(job_id: str) -> None:
+async def delete_3d_job(job_id: str) -> None:
     """Delete a 3D job from storage."""
     store = get_job_store()
-    store.delete(PREFIX_3D, job_id)
+    await store.delete(PREFIX_3D, job_id)
 
 
-def get_image_job(job_id: str) -> dict | None:
+async def get_image_job(job_id: str) -> dict | None:
     """Get an image job from storage."""
     store = get_job_store()
-    return store.get(PREFIX_IMAGE, job_id)
+    return await store.get(PREFIX_IMAGE, job_id)
 
 
-def set_image_job(job_id: str, data: dict) -> None:
+async def set_image_job(job_id: str, data: dict) -> None:
     """Store an image job."""
     store = get_job_store()
-    store.set(PREFIX_IMAGE, job_id, data, JOB_TTL)
+    await store.set(PREFIX_IMAGE, job_id, data, JOB_TTL)
 
 
-def delete_image_job(job_id: str) -> None:
+async def delete_image_job(job_id: str) -> None:
     """Delete an image job from storage."""
     store = get_job_store()
-    store.delete(PREFIX_IMAGE, job_id)
+    await store.delete(PREFIX_IMAGE, job_id)
 
 
-def delete_pipeline_job(job_id: str) -> None:
+async def delete_pipeline_job(job_id: str) -> None:
     """Delete a pipeline job from storage."""
     store = get_job_store()
-    store.delete(PREFIX_PIPELINE, job_id)
+    await store.delete(PREFIX_PIPELINE, job_id)
 
 
 # =============================================================================
@@ -138,6 +140,34 @@ async def generate_image(request: ImageGenerateRequest):
         raise HTTPException(status_code=500, detail=f"Image generation failed: {e}")
 
 
+@router.post("/generate-image-stream")
+async def generate_image_stream(request: ImageGenerateRequest):
+    """
+    Stream DALL-E 3 views as Server-Sent Events in completion order.
+    Each event is {"index", "url"} or {"index", "error"}; a final "done" event ends the stream.
+    """
+    openai_svc = OpenAIService()
+    if not openai_svc.is_configured:
+        raise HTTPException(status_code=503, detail="OpenAI not configured. Set OPENAI_API_KEY.")
+
+    async def event_stream():
+        async for view in openai_svc.generate_images_stream(
+            prompt=request.prompt,
+            num_images=request.num_images,
+            size=request.size,
+            quality=request.quality,
+            style=request.style
+        ):
+            yield f"data: {orjson.dumps(view).decode()}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @router.post("/generate-3d", response_model=TrellisResponse)
 async def generate_3d(request: TrellisRequest):
     """
@@ -181,14 +211,14 @@ async def _run_pipeline_async(job_id: str, request: PipelineRequest):
         progress=0,
         message="Starting pipeline..."
     )
-    set_pipeline_job(job)
+    await set_pipeline_job(job)
 
     try:
         # Stage 1
         job.status = "cleaning_prompt"
         job.progress = 10
         job.message = "Cleaning prompt with AI..."
-        set_pipeline_job(job)
+        await set_pipeline_job(job)
 
         clean_result = await openai_svc.clean_prompt(request.prompt, request.style)
 
@@ -196,7 +226,7 @@ async def _run_pipeline_async(job_id: str, request: PipelineRequest):
         job.status = "generating_images"
         job.progress = 30
         job.message = "Generating 2D images with DALL-E..."
-        set_pipeline_job(job)
+        await set_pipeline_job(job)
 
         image_result = await openai_svc.generate_images(
             prompt=clean_result.dalle_prompt,
@@ -208,7 +238,7 @@ async def _run_pipeline_async(job_id: str, request: PipelineRequest):
         job.status = "generating_3d"
         job.progress = 60
         job.message = "Generating 3D model with Trellis..."
-        set_pipeline_job(job)
+        await set_pipeline_job(job)
 
         use_multi = request.num_views > 1 and len(image_result.images) > 1
 
@@ -236,13 +266,13 @@ async def _run_pipeline_async(job_id: str, request: PipelineRequest):
             total_time=0,
             stages={}
         )
-        set_pipeline_job(job)
+        await set_pipeline_job(job)
 
     except Exception as e:
         job.status = "failed"
         job.progress = 0
         job.message = f"Error: {e}"
-        set_pipeline_job(job)
+        await set_pipeline_job(job)
 
 
 @router.post("/generate-architecture-async")
@@ -275,10 +305,12 @@ async def generate_architecture_async(
 @router.get("/job/{job_id}", response_model=JobStatus)
 async def get_job_status(job_id: str):
     """Get status of an async generation job."""
-    job = get_pipeline_job(job_id)
-    if not job:
+    # Polled constantly by the client: return the stored dict (written from
+    # JobStatus.model_dump) as-is, skipping model rebuild and response validation
+    data = await get_job_store().get(PREFIX_PIPELINE, job_id)
+    if not data:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    return ORJSONResponse(data)
 
 
 # =============================================================================
@@ -299,7 +331,7 @@ async def generate_preview(request: PreviewRequest):
     job_id = uuid.uuid4().hex
 
     # Track image generation job
-    set_image_job(job_id, {
+    await set_image_job(job_id, {
         "job_id": job_id,
         "status": "generating",
         "progress": 10,
@@ -311,7 +343,7 @@ async def generate_preview(request: PreviewRequest):
         clean_result = await openai_svc.clean_prompt(request.prompt, request.style)
 
         # Stage 2: Generate images
-        set_image_job(job_id, {
+        await set_image_job(job_id, {
             "job_id": job_id,
             "status": "generating",
             "progress": 30,
@@ -325,7 +357,7 @@ async def generate_preview(request: PreviewRequest):
         )
 
         # Remove from active jobs when complete
-        delete_image_job(job_id)
+        await delete_image_job(job_id)
 
         return PreviewResponse(
             job_id=job_id,
@@ -335,11 +367,12 @@ async def generate_preview(request: PreviewRequest):
             dalle_prompt=clean_result.dalle_prompt,
             image_urls=image_result.images,
             preview_3d_url=image_result.preview_3d_url,
+            failed_views=image_result.failed_views,
             message="2D images ready! Click Finish to generate 3D model."
         )
 
     except Exception as e:
-        delete_image_job(job_id)
+        await delete_image_job(job_id)
         raise HTTPException(status_code=500, detail=f"Preview generation failed: {e}")
 
 
@@ -353,7 +386,7 @@ async def _run_3d_generation(job_id: str, image_urls: list[str], texture_size: i
         progress=10,
         message="Starting 3D model generation..."
     )
-    set_3d_job(job)
+    await set_3d_job(job)
 
     try:
         start_time = time.time()
@@ -361,7 +394,7 @@ async def _run_3d_generation(job_id: str, image_urls: list[str], texture_size: i
         # Update progress
         job.progress = 30
         job.message = "Processing images with Trellis..."
-        set_3d_job(job)
+        await set_3d_job(job)
 
         result = await fal_svc.generate_3d(
             image_url=image_urls[0] if not use_multi else None,
@@ -379,13 +412,13 @@ async def _run_3d_generation(job_id: str, image_urls: list[str], texture_size: i
         job.model_file = result.file_name
         job.download_url = f"/download/{result.file_name}"
         job.generation_time = generation_time
-        set_3d_job(job)
+        await set_3d_job(job)
 
     except Exception as e:
         job.status = "failed"
         job.progress = 0
         job.message = f"Error: {e}"
-        set_3d_job(job)
+        await set_3d_job(job)
 
 
 @router.post("/start-3d")
@@ -412,7 +445,7 @@ async def start_3d_generation(
         progress=0,
         message="Queued for 3D generation..."
     )
-    set_3d_job(job)
+    await set_3d_job(job)
 
     # Determine if multi-view
     use_multi = request.use_multi and len(request.image_urls) > 1
@@ -436,10 +469,11 @@ async def start_3d_generation(
 @router.get("/3d-job/{job_id}", response_model=ThreeDJobStatus)
 async def get_3d_job_status(job_id: str):
     """Get status of a 3D generation job."""
-    job = get_3d_job(job_id)
-    if not job:
+    # Polled constantly by the client: return the stored dict as-is (see /job)
+    data = await get_job_store().get(PREFIX_3D, job_id)
+    if not data:
         raise HTTPException(status_code=404, detail="3D job not found")
-    return job
+    return ORJSONResponse(data)
 
 
 @router.get("/jobs", response_model=ActiveJobsResponse)
@@ -452,7 +486,7 @@ async def list_active_jobs():
     active_jobs: list[ActiveJob] = []
 
     # Collect active image generation jobs
-    for job_data in store.get_all(PREFIX_IMAGE):
+    for job_data in await store.get_all(PREFIX_IMAGE):
         active_jobs.append(ActiveJob(
             job_id=job_data["job_id"],
             type="image",
@@ -462,7 +496,7 @@ async def list_active_jobs():
         ))
 
     # Collect active 3D generation jobs
-    for job_data in store.get_all(PREFIX_3D):
+    for job_data in await store.get_all(PREFIX_3D):
         if job_data["status"] in ("pending", "generating"):
             active_jobs.append(ActiveJob(
                 job_id=job_data["job_id"],
@@ -473,7 +507,7 @@ async def list_active_jobs():
             ))
 
     # Collect active pipeline jobs
-    for job_data in store.get_all(PREFIX_PIPELINE):
+    for job_data in await store.get_all(PREFIX_PIPELINE):
         if job_data["status"] not in ("completed", "failed"):
             active_jobs.append(ActiveJob(
                 job_id=job_data["job_id"],
@@ -510,22 +544,22 @@ async def cancel_job(job_id: str):
     job_type = None
 
     # Check and cancel 3D job
-    job_3d = get_3d_job(job_id)
+    job_3d = await get_3d_job(job_id)
     if job_3d and job_3d.status in ("pending", "generating"):
-        delete_3d_job(job_id)
+        await delete_3d_job(job_id)
         cancelled = True
         job_type = "3d"
 
     # Check and cancel image job
-    if get_image_job(job_id):
-        delete_image_job(job_id)
+    if await get_image_job(job_id):
+        await delete_image_job(job_id)
         cancelled = True
         job_type = "image"
 
     # Check and cancel pipeline job
-    job_pipeline = get_pipeline_job(job_id)
+    job_pipeline = await get_pipeline_job(job_id)
     if job_pipeline and job_pipeline.status not in ("completed", "failed"):
-        delete_pipeline_job(job_id)
+        await delete_pipeline_job(job_id)
         cancelled = True
         job_type = "pipeline"
 
@@ -546,15 +580,15 @@ async def cleanup_finished_jobs():
     pipeline_deleted = 0
 
     # Clean up completed/failed 3D jobs
-    for job_data in store.get_all(PREFIX_3D):
+    for job_data in await store.get_all(PREFIX_3D):
         if job_data["status"] in ("completed", "failed"):
-            delete_3d_job(job_data["job_id"])
+            await delete_3d_job(job_data["job_id"])
             three_d_deleted += 1
 
     # Clean up completed/failed pipeline jobs
-    for job_data in store.get_all(PREFIX_PIPELINE):
+    for job_data in await store.get_all(PREFIX_PIPELINE):
         if job_data["status"] in ("completed", "failed"):
-            delete_pipeline_job(job_data["job_id"])
+            await delete_pipeline_job(job_data["job_id"])
             pipeline_deleted += 1
 
     return {
@@ -39,5 +39,6 @@ async def health_check():
     return {
         "status": "healthy",
         "openai_configured": openai_svc.is_configured,
+        "openai_circuit": openai_svc.circuit_state,
         "fal_configured": fal_svc.is_configured
     }
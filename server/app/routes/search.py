@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 import aiohttp
 import asyncio
+import orjson
 import math
 
-from ..services import OpenAIService, GeocodingService, calculate_zoom_for_location_type
+from ..services import OpenAIService, GeocodingService, calculate_zoom_for_location_type, get_http_session
 
 router = APIRouter()
 
@@ -192,15 +194,14 @@ async def fetch_buildings_in_bbox(bbox: dict, include_towers: bool = False) -> l
 
     for endpoint in endpoints:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    endpoint,
-                    data={"data": overpass_query},
-                    timeout=aiohttp.ClientTimeout(total=20)
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    break  # Success, exit loop
+            async with get_http_session().post(
+                endpoint,
+                data={"data": overpass_query},
+                timeout=aiohttp.ClientTimeout(total=20)
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+                break  # Success, exit loop
         except (aiohttp.ClientError, asyncio.TimeoutError):
             continue  # Try next endpoint
 
@@ -345,6 +346,48 @@ async def agentic_search(request: SearchRequest):
       "biggest footprint near Central Park"
     - Area exploration: "what buildings are here"
     """
+    return await run_search(request)
+
+
+@router.post("/search-stream")
+async def agentic_search_stream(request: SearchRequest):
+    """
+    Same as POST /search, but as Server-Sent Events so the LLM answer can be shown
+    while it is generated. A "result" event carries the search response (with
+    "answer" null when it is streamed), then {"delta": text} events follow and a
+    final "done" event ends the stream.
+    """
+    deferred_answer: dict = {}
+    result = await run_search(request, deferred_answer)
+
+    async def event_stream():
+        yield f"event: result\ndata: {orjson.dumps(result).decode()}\n\n"
+        if deferred_answer:
+            openai_svc = OpenAIService()
+            async for delta in openai_svc.generate_search_answer_stream(**deferred_answer):
+                yield f"data: {orjson.dumps({'delta': delta}).decode()}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def run_search(request: SearchRequest, deferred_answer: Optional[dict] = None) -> dict:
+    """
+    Run an agentic search.
+
+    Args:
+        request: Search request
+        deferred_answer: If given, LLM answers are not generated inline; the
+            arguments for generate_search_answer are stored here instead and the
+            response's "answer" is left as None for the caller to stream
+
+    Returns:
+        Search response dict
+    """
     try:
         openai_svc = OpenAIService()
         geocoding_svc = GeocodingService()
@@ -353,11 +396,24 @@ async def agentic_search(request: SearchRequest):
         intent = await openai_svc.parse_search_intent(request.query)
         action = intent.get("action", "search_area")
 
+        # LLM answers are generated inline, or deferred to the caller when streaming
+        async def answer_for(top_result: Optional[dict], location_name: Optional[str]) -> Optional[str]:
+            answer_args = {
+                "query": request.query,
+                "top_result": top_result,
+                "location_name": location_name,
+                "intent": intent
+            }
+            if deferred_answer is not None:
+                deferred_answer.update(answer_args)
+                return None
+            return await openai_svc.generate_search_answer(**answer_args)
+
         # Step 2: Route based on action
 
         # === Weather Control ===
         if action == "set_weather":
-            weather_settings = intent.get("weather_settings", {"type": "clear"})
+            weather_settings = intent.get("weather_settings") or {"type": "clear"}
             weather_type = weather_settings.get("type", "clear")
             answer_map = {
                 "rain": "Making it rain...",
@@ -378,7 +434,7 @@ async def agentic_search(request: SearchRequest):
 
         # === Time Control ===
         elif action == "set_time":
-            time_settings = intent.get("time_settings", {"preset": "day"})
+            time_settings = intent.get("time_settings") or {"preset": "day"}
             preset = time_settings.get("preset", "day")
             answer_map = {
                 "night": "Switching to night mode...",
@@ -398,7 +454,7 @@ async def agentic_search(request: SearchRequest):
 
         # === Camera Control ===
         elif action == "camera_control":
-            camera_settings = intent.get("camera_settings", {})
+            camera_settings = intent.get("camera_settings") or {}
 
             # Generate appropriate answer
             if camera_settings.get("zoom_delta"):
@@ -504,7 +560,7 @@ async def agentic_search(request: SearchRequest):
 
         # === Q&A Mode ===
         elif action == "question":
-            question_context = intent.get("question_context", {})
+            question_context = intent.get("question_context") or {}
             target_name = question_context.get("target_name")
 
             building_data = None
@@ -531,12 +587,9 @@ async def agentic_search(request: SearchRequest):
                         if not building_data:
                             building_data = buildings[0]
 
-            # Generate answer using LLM
-            answer = await openai_svc.generate_qa_answer(
-                query=request.query,
-                building_data=building_data,
-                question_context=question_context
-            )
+            # The intent call already answered from world knowledge; only fall
+            # back to a separate answer call if it didn't
+            answer = intent.get("answer") or await answer_for(building_data, target_name)
 
             return {
                 "intent": intent,
@@ -666,12 +719,7 @@ async def agentic_search(request: SearchRequest):
             buildings = await fetch_buildings_in_bbox(bbox, include_towers=include_towers)
 
             if not buildings:
-                answer = await openai_svc.generate_search_answer(
-                    query=request.query,
-                    top_result=None,
-                    location_name=location_name,
-                    intent=intent
-                )
+                answer = await answer_for(None, location_name)
                 return {
                     "intent": intent,
                     "answer": answer,
@@ -691,12 +739,7 @@ async def agentic_search(request: SearchRequest):
             candidates = ranked[1:limit] if len(ranked) > 1 else []
 
             # Generate answer with LLM
-            answer = await openai_svc.generate_search_answer(
-                query=request.query,
-                top_result=target,
-                location_name=location_name,
-                intent=intent
-            )
+            answer = await answer_for(target, location_name)
 
             target_center = get_building_center(target) if target else search_center
 
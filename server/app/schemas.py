@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # =============================================================================
@@ -41,6 +41,7 @@ class ImageGenerateResponse(BaseModel):
     images: list[str]
     prompt_used: str
     preview_3d_url: Optional[str] = None  # 3D perspective preview for user visualization (not used for Trellis)
+    failed_views: list[str] = []  # Requested views (front/side/top/isometric) that failed and are missing from images
 
 
 # =============================================================================
@@ -150,6 +151,7 @@ class PreviewResponse(BaseModel):
     dalle_prompt: str
     image_urls: list[str]
     preview_3d_url: Optional[str] = None  # 3D perspective preview for user visualization (not used for Trellis)
+    failed_views: list[str] = []  # Requested views that failed and are missing from image_urls
     message: str
 
 
@@ -189,3 +191,62 @@ class ActiveJobsResponse(BaseModel):
     three_d_jobs: int
     pipeline_jobs: int
     jobs: list[ActiveJob]
+
+
+# =============================================================================
+# OpenAI Structured Outputs
+# =============================================================================
+# Response formats for chat.completions.parse. Strict mode requires every
+# field, so fields that don't apply to a response are null rather than absent.
+
+class _StrictModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+
+class CleanedPrompt(_StrictModel):
+    """clean_prompt output."""
+    cleaned_prompt: str
+    dalle_prompt: str
+    style_tags: list[str]
+
+
+class BuildingAttributes(_StrictModel):
+    """Ranking criteria for find_building."""
+    sort_by: Optional[Literal["height", "area", "underdeveloped"]]
+    building_type: Literal["commercial", "residential", "any"]
+    limit: int
+
+
+class WeatherSettings(_StrictModel):
+    type: Literal["rain", "snow", "clear"]
+
+
+class TimeSettings(_StrictModel):
+    preset: Literal["day", "night"]
+
+
+class CameraSettings(_StrictModel):
+    zoom_delta: Optional[float]
+    pitch: Optional[float]
+    bearing_delta: Optional[float]
+
+
+class QuestionContext(_StrictModel):
+    target_name: Optional[str]
+
+
+class SearchIntent(_StrictModel):
+    """parse_search_intent output."""
+    action: Literal[
+        "navigate", "find_building", "search_area", "set_weather",
+        "set_time", "camera_control", "delete_building", "question"
+    ]
+    location_query: Optional[str]
+    building_attributes: Optional[BuildingAttributes]
+    search_radius_km: Optional[float]
+    weather_settings: Optional[WeatherSettings]
+    time_settings: Optional[TimeSettings]
+    camera_settings: Optional[CameraSettings]
+    question_context: Optional[QuestionContext]
+    answer: Optional[str]
+    reasoning: str
@@ -1,4 +1,4 @@
-from .openai_service import OpenAIService
+from .openai_service import OpenAIService, close_openai_client
 from .fal_service import FalService
 from .geocoding_service import (
     GeocodingService,
@@ -6,13 +6,20 @@ from .geocoding_service import (
     calculate_zoom_for_location_type,
 )
 from .redis_service import JobStore, get_job_store
+from .cache_service import SemanticCache, get_semantic_cache
+from .http_service import get_http_session, close_http_sessions
 
 __all__ = [
     "OpenAIService",
+    "close_openai_client",
     "FalService",
     "GeocodingService",
     "GeocodingResult",
     "calculate_zoom_for_location_type",
     "JobStore",
     "get_job_store",
+    "SemanticCache",
+    "get_semantic_cache",
+    "get_http_session",
+    "close_http_sessions",
 ]
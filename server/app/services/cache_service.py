@@ -0,0 +1,162 @@
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Any
+
+import numpy as np
+
+from ..config import get_settings
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivial variations share a key."""
+    return " ".join(text.lower().split())
+
+
+class SemanticCache:
+    """
+    Two-tier in-process cache for deterministic OpenAI responses.
+
+    L1: exact match on a blake2b hash of the normalized input (LRU + TTL).
+    L2: near-duplicate match by cosine similarity of input embeddings.
+    Entries are grouped by namespace so e.g. different styles never collide.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl: int = 600,
+        similarity_threshold: float = 0.95
+    ):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._threshold = similarity_threshold
+        # key -> (expires_at, namespace, value, unit-normalized embedding or None)
+        self._entries: OrderedDict[
+            str, tuple[float, str, dict[str, Any], Optional[np.ndarray]]
+        ] = OrderedDict()
+        # namespace -> (embedding rows with spare capacity, matching keys).
+        # New entries are appended in place; built lazily and rebuilt only
+        # after one of the namespace's embedded entries is evicted.
+        self._matrices: dict[str, tuple[np.ndarray, list[str]]] = {}
+
+    @staticmethod
+    def _key(namespace: str, text: str) -> str:
+        return hashlib.blake2b(
+            f"{namespace}|{normalize_text(text)}".encode(), digest_size=16
+        ).hexdigest()
+
+    def _evict(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry[3] is not None:
+            self._matrices.pop(entry[1], None)
+
+    def get_exact(self, namespace: str, text: str) -> Optional[dict[str, Any]]:
+        """L1 lookup: exact match on the normalized input."""
+        key = self._key(namespace, text)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def get_similar(
+        self, namespace: str, embedding: list[float]
+    ) -> Optional[dict[str, Any]]:
+        """L2 lookup: best cached entry above the cosine similarity threshold."""
+        matrix, keys = self._get_matrix(namespace)
+        if not keys:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self._threshold:
+            return None
+
+        key = keys[best]
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def set(
+        self,
+        namespace: str,
+        text: str,
+        value: dict[str, Any],
+        embedding: Optional[list[float]] = None
+    ) -> None:
+        """Store a response, optionally with its input embedding for L2 matching."""
+        key = self._key(namespace, text)
+        self._evict(key)
+
+        vector: Optional[np.ndarray] = None
+        if embedding is not None:
+            vector = np.asarray(embedding, dtype=np.float32)
+            vector /= np.linalg.norm(vector) or 1.0
+
+        self._entries[key] = (time.monotonic() + self._ttl, namespace, value, vector)
+        while len(self._entries) > self._max_entries:
+            self._evict(next(iter(self._entries)))
+        if vector is not None:
+            self._append_row(namespace, key, vector)
+
+    def _append_row(self, namespace: str, key: str, vector: np.ndarray) -> None:
+        """Add a new embedding to a namespace's built matrix without restacking it."""
+        cached = self._matrices.get(namespace)
+        if cached is None:
+            return  # Not built yet (or invalidated); the next lookup picks it up
+        buffer, keys = cached
+        count = len(keys)
+        if count == len(buffer):
+            # Double the capacity so appends stay amortized O(dimensions)
+            grown = np.empty((max(2 * count, 16), vector.shape[0]), dtype=np.float32)
+            if count:
+                grown[:count] = buffer
+            buffer = grown
+            self._matrices[namespace] = (buffer, keys)
+        buffer[count] = vector
+        keys.append(key)
+
+    def _get_matrix(self, namespace: str) -> tuple[np.ndarray, list[str]]:
+        """Stack the embeddings of a namespace, caching until an entry is evicted."""
+        cached = self._matrices.get(namespace)
+        if cached is not None:
+            rows, row_keys = cached
+            return rows[:len(row_keys)], row_keys
+
+        now = time.monotonic()
+        keys: list[str] = []
+        vectors: list[np.ndarray] = []
+        for key, (expires_at, entry_ns, _, vector) in self._entries.items():
+            if entry_ns == namespace and vector is not None and expires_at >= now:
+                keys.append(key)
+                vectors.append(vector)
+
+        matrix = np.stack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+        self._matrices[namespace] = (matrix, keys)
+        return matrix, keys
+
+
+# Global instance
+_semantic_cache: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get the global semantic cache instance."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        settings = get_settings()
+        _semantic_cache = SemanticCache(
+            max_entries=settings.semantic_cache_max_entries,
+            ttl=settings.semantic_cache_ttl,
+            similarity_threshold=settings.semantic_cache_threshold
+        )
+    return _semantic_cache
@@ -4,11 +4,13 @@ import uuid
 import asyncio
 from pathlib import Path
 
+import aiofiles
 import aiohttp
 import fal_client
 
 from ..config import get_settings
 from ..schemas import TrellisResponse
+from .http_service import get_http_session
 
 
 class FalService:
@@ -18,6 +20,8 @@ class FalService:
     TRELLIS_SINGLE = "fal-ai/trellis"
     TRELLIS_MULTI = "fal-ai/trellis/multi"
 
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
     def __init__(self):
         settings = get_settings()
         self._configured = bool(settings.fal_key)
@@ -42,8 +46,20 @@ class FalService:
         """
         settings = get_settings()
         local_path = settings.cache_dir / filename
-        local_path.write_bytes(image_data)
+        await asyncio.to_thread(local_path.write_bytes, image_data)
+
+        return await self.upload_file(local_path)
 
+    async def upload_file(self, local_path: Path) -> str:
+        """
+        Upload a local image file to fal.ai storage.
+
+        Args:
+            local_path: Path of the file to upload
+
+        Returns:
+            URL of uploaded image
+        """
         url = await asyncio.to_thread(fal_client.upload_file, str(local_path))
         return url
 
@@ -119,7 +135,10 @@ class FalService:
         # Extract result
         model_mesh = result.get("model_mesh", {})
         glb_url = model_mesh.get("url")
-        file_name = model_mesh.get("file_name", f"model_{uuid.uuid4().hex[:8]}.glb")
+        # fal reuses names like "model.glb" across jobs; suffix fal's stem (its
+        # basename only) so concurrent generations never overwrite each other
+        stem = Path(model_mesh.get("file_name") or "model").stem or "model"
+        file_name = f"{stem}-{uuid.uuid4().hex[:12]}.glb"
 
         if not glb_url:
             raise RuntimeError("No GLB URL in Trellis response")
@@ -138,9 +157,19 @@ class FalService:
 
     async def _download_file(self, url: str, output_path: Path) -> None:
         """Download file from URL to local path."""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
+        # Stream into a temp file and rename, so the GLB is never held in memory
+        # whole and /download never sees a partially written file
+        tmp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.part")
+        try:
+            async with get_http_session().get(
+                url, timeout=aiohttp.ClientTimeout(total=300)
+            ) as response:
                 if response.status != 200:
                     raise RuntimeError(f"Failed to download: {response.status}")
-                content = await response.read()
-                output_path.write_bytes(content)
+                async with aiofiles.open(tmp_path, "wb") as out:
+                    async for chunk in response.content.iter_chunked(self.DOWNLOAD_CHUNK_SIZE):
+                        await out.write(chunk)
+            await asyncio.to_thread(os.replace, tmp_path, output_path)
+        finally:
+            # Already renamed on success; one syscall either way
+            tmp_path.unlink(missing_ok=True)
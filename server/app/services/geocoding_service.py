@@ -2,6 +2,8 @@ import aiohttp
 from typing import Optional
 from dataclasses import dataclass
 
+from .http_service import get_http_session
+
 
 @dataclass
 class GeocodingResult:
@@ -97,61 +99,54 @@ class GeocodingService:
 
         try:
             # Disable SSL verification for development (macOS Python 3.14 SSL cert issue)
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(
-                    self.NOMINATIM_URL,
-                    params=params,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    if not data:
-                        return None
-
-                    result = data[0]
-
-                    # Parse bounding box if available
-                    bbox = None
-                    if "boundingbox" in result:
-                        # Nominatim returns [south, north, west, east]
-                        bbox = [float(x) for x in result["boundingbox"]]
-
-                    # Determine location type
-                    location_type = result.get("type", "unknown")
-                    osm_class = result.get("class", "")
-                    if osm_class == "boundary":
-                        location_type = "city" if location_type == "administrative" else location_type
-                    elif osm_class == "building":
-                        location_type = "building"
-                    elif osm_class == "amenity":
-                        location_type = "landmark"
-                    elif osm_class == "tourism":
-                        location_type = "poi"
-                    elif osm_class == "man_made":
-                        location_type = "poi"
-                    elif osm_class == "place":
-                        location_type = "place"
-
-                    # Shorten the verbose display name
-                    full_display_name = result.get("display_name", query)
-                    address = result.get("address", {})
-                    short_name = shorten_display_name(full_display_name, address)
-
-                    return GeocodingResult(
-                        lat=float(result["lat"]),
-                        lon=float(result["lon"]),
-                        display_name=short_name,
-                        location_type=location_type,
-                        bounding_box=bbox
-                    )
+            async with get_http_session(verify_ssl=False).get(
+                self.NOMINATIM_URL,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+
+                if not data:
+                    return None
+
+                result = data[0]
+
+                # Parse bounding box if available
+                bbox = None
+                if "boundingbox" in result:
+                    # Nominatim returns [south, north, west, east]
+                    bbox = [float(x) for x in result["boundingbox"]]
+
+                # Determine location type
+                location_type = result.get("type", "unknown")
+                osm_class = result.get("class", "")
+                if osm_class == "boundary":
+                    location_type = "city" if location_type == "administrative" else location_type
+                elif osm_class == "building":
+                    location_type = "building"
+                elif osm_class == "amenity":
+                    location_type = "landmark"
+                elif osm_class == "tourism":
+                    location_type = "poi"
+                elif osm_class == "man_made":
+                    location_type = "poi"
+                elif osm_class == "place":
+                    location_type = "place"
+
+                # Shorten the verbose display name
+                full_display_name = result.get("display_name", query)
+                address = result.get("address", {})
+                short_name = shorten_display_name(full_display_name, address)
+
+                return GeocodingResult(
+                    lat=float(result["lat"]),
+                    lon=float(result["lon"]),
+                    display_name=short_name,
+                    location_type=location_type,
+                    bounding_box=bbox
+                )
 
         except (aiohttp.ClientError, KeyError, ValueError) as e:
             print(f"Geocoding error: {e}")
@@ -180,32 +175,25 @@ class GeocodingService:
 
         try:
             # Disable SSL verification for development (macOS Python 3.14 SSL cert issue)
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(
-                    self.NOMINATIM_REVERSE_URL,
-                    params=params,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    response.raise_for_status()
-                    result = await response.json()
-
-                    if "error" in result:
-                        return None
-
-                    return GeocodingResult(
-                        lat=lat,
-                        lon=lon,
-                        display_name=result.get("display_name", "Unknown location"),
-                        location_type=result.get("type", "unknown"),
-                        bounding_box=None
-                    )
+            async with get_http_session(verify_ssl=False).get(
+                self.NOMINATIM_REVERSE_URL,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                response.raise_for_status()
+                result = await response.json()
+
+                if "error" in result:
+                    return None
+
+                return GeocodingResult(
+                    lat=lat,
+                    lon=lon,
+                    display_name=result.get("display_name", "Unknown location"),
+                    location_type=result.get("type", "unknown"),
+                    bounding_box=None
+                )
 
         except (aiohttp.ClientError, KeyError, ValueError) as e:
             print(f"Reverse geocoding error: {e}")
@@ -0,0 +1,48 @@
+import ssl
+
+import aiohttp
+
+# Services and routes make outbound HTTP calls per request (fal downloads,
+# Nominatim, Overpass), so they share pooled aiohttp sessions per process
+# instead of paying a new TCP/TLS handshake each time. Closed from the app
+# lifespan on shutdown.
+_sessions: dict[bool, aiohttp.ClientSession] = {}
+
+
+def get_http_session(verify_ssl: bool = True) -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating it on first use.
+
+    Args:
+        verify_ssl: False returns a separate session that skips certificate
+            verification (used for Nominatim in development)
+
+    Returns:
+        Pooled aiohttp session; pass per-request timeouts to its methods
+    """
+    session = _sessions.get(verify_ssl)
+    if session is None or session.closed:
+        ssl_param: ssl.SSLContext | bool = True
+        if not verify_ssl:
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+            ssl_param = ssl_context
+
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=50,
+                keepalive_timeout=30,
+                ssl=ssl_param
+            )
+        )
+        _sessions[verify_ssl] = session
+    return session
+
+
+async def close_http_sessions() -> None:
+    """Close the shared aiohttp sessions that were created."""
+    for session in _sessions.values():
+        await session.close()
+    _sessions.clear()
@@ -1,78 +1,302 @@
-import json
+import re
+import time
+import logging
+import hashlib
 import asyncio
-from typing import Optional, Literal, cast
+from collections import Counter
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Literal, TypeVar, cast
+import httpx
 import openai
+import orjson
+from openai.types.chat import ChatCompletionMessageParam, ParsedChatCompletion
+from pydantic import BaseModel
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
 from ..config import get_settings
-from ..schemas import PromptCleanResponse, ImageGenerateResponse
+from ..schemas import (
+    PromptCleanResponse,
+    ImageGenerateResponse,
+    CleanedPrompt,
+    SearchIntent,
+)
+from .cache_service import get_semantic_cache, normalize_text
+from .redis_service import get_job_store
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+ParsedT = TypeVar("ParsedT", bound=BaseModel)
+
+# Routes create an OpenAIService per request, so the client (and its
+# aiohttp connection pool) is built once per process and shared. Closed from
+# the app lifespan on shutdown.
+@lru_cache(maxsize=1)
+def _get_client() -> Optional[openai.AsyncOpenAI]:
+    """Get the shared OpenAI client, or None if no API key is set."""
+    settings = get_settings()
+    if not settings.openai_api_key:
+        return None
+    return openai.AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        max_retries=3,
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        http_client=openai.DefaultAioHttpClient(
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=30.0  # Keep idle TLS connections warm between bursts
+            )
+        )
+    )
+
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client if it was created."""
+    if _get_client.cache_info().currsize:
+        client = _get_client()
+        if client is not None:
+            await client.close()
+        _get_client.cache_clear()
+
+
+def _keyword_re(keywords: Iterable[str], whole_word: bool = False) -> re.Pattern[str]:
+    """
+    Compile keywords into a single alternation anchored at the word start.
+
+    Without whole_word the end is left open so plurals ("heights", "areas") match.
+    """
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})" + (r"\b" if whole_word else ""))
+
+
+class _RateLimiter:
+    """
+    Token-bucket throttle after the OpenAI cookbook's api_request_parallel_processor.
+    Request and token capacity refill continuously up to their per-minute limits;
+    callers wait in order until enough capacity is available.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float = 0):
+        self._rpm = requests_per_minute
+        self._tpm = tokens_per_minute
+        self._request_capacity = requests_per_minute
+        self._token_capacity = tokens_per_minute
+        self._last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed_minutes = (now - self._last_update) / 60
+        self._last_update = now
+        # Bucket holds at least one request so rates under 1 RPM still make progress
+        self._request_capacity = min(
+            max(self._rpm, 1), self._request_capacity + self._rpm * elapsed_minutes
+        )
+        if self._tpm:
+            self._token_capacity = min(
+                self._tpm, self._token_capacity + self._tpm * elapsed_minutes
+            )
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until one request (and `tokens` tokens, if limited) can be spent."""
+        async with self._lock:
+            while True:
+                self._refill()
+                has_tokens = not self._tpm or self._token_capacity >= tokens
+                if self._request_capacity >= 1 and has_tokens:
+                    self._request_capacity -= 1
+                    if self._tpm:
+                        self._token_capacity -= tokens
+                    return
+
+                wait = max(0.0, (1 - self._request_capacity) * 60 / self._rpm)
+                if not has_tokens:
+                    wait = max(wait, (tokens - self._token_capacity) * 60 / self._tpm)
+                await asyncio.sleep(wait)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the OpenAI circuit is open and calls are short-circuited."""
+
+
+class _CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for provider calls.
+
+    After `fail_max` provider failures in a row the circuit opens and calls are
+    rejected immediately for `reset_timeout` seconds. The first call after that
+    is a half-open trial: success closes the circuit, failure re-opens it.
+    """
+
+    # Errors that indicate the provider is degraded (not a bad request)
+    PROVIDER_ERRORS = (
+        openai.APIConnectionError,
+        openai.InternalServerError,
+        openai.RateLimitError,
+        asyncio.TimeoutError,
+    )
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 30.0):
+        self._name = name
+        self._fail_max = fail_max
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.transitions: Counter[str] = Counter()  # State transition counts
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open, or half_open."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self._reset_timeout:
+            return "open"
+        return "half_open"
+
+    def _transition(self, state: str) -> None:
+        self.transitions[state] += 1
+        logger.warning("%s circuit %s", self._name, state)
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[T]],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> T:
+        """Await func(*args, **kwargs) through the breaker, with an optional timeout."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            raise CircuitOpenError(f"{self._name} circuit open")
+
+        trial = state == "half_open"
+        self._trial_in_flight = trial
+        try:
+            result = await asyncio.wait_for(func(*args, **kwargs), timeout)
+        except self.PROVIDER_ERRORS:
+            self._failures += 1
+            if trial or self._failures >= self._fail_max:
+                if self._opened_at is None or trial:
+                    self._transition("open")
+                self._opened_at = time.monotonic()
+            raise
+        finally:
+            if trial:
+                self._trial_in_flight = False
+
+        if self._opened_at is not None:
+            self._transition("closed")
+        self._failures = 0
+        self._opened_at = None
+        return result
+
+
+@lru_cache(maxsize=1)
+def _get_circuit_breaker() -> _CircuitBreaker:
+    """Get the process-wide breaker shared by all OpenAI chat calls."""
+    return _CircuitBreaker("OpenAI chat", fail_max=5, reset_timeout=30.0)
+
+
+@lru_cache(maxsize=1)
+def _get_embedding_breaker() -> _CircuitBreaker:
+    """
+    Get the process-wide breaker for cache embedding calls, kept apart from
+    chat so a failing cache lookup can't open the circuit for real requests.
+    """
+    return _CircuitBreaker("OpenAI embedding", fail_max=5, reset_timeout=30.0)
+
+
+def _worker_count() -> int:
+    """Number of server processes sharing the account-wide DALL-E limits."""
+    settings = get_settings()
+    # Debug runs with reload, which forces a single process
+    return 1 if settings.debug else max(1, settings.workers)
+
+
+@lru_cache(maxsize=1)
+def _get_image_rate_limiter() -> _RateLimiter:
+    """
+    Get the process-wide DALL-E rate limiter. The configured RPM is for the
+    whole account, so each worker gets an equal share of it.
+    """
+    return _RateLimiter(
+        requests_per_minute=get_settings().dalle_requests_per_minute / _worker_count()
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_image_semaphore() -> asyncio.Semaphore:
+    """Get the process-wide cap on in-flight DALL-E requests (a per-worker share)."""
+    return asyncio.Semaphore(max(1, get_settings().dalle_max_concurrent // _worker_count()))
 
 
 class OpenAIService:
     """Service for OpenAI API interactions."""
 
-    SEARCH_INTENT_PROMPT = """You are an intelligent map search assistant. Parse user queries to understand their intent.
-Users may have typos, misspellings, or use informal language. Always correct and interpret their intent.
-
-Analyze the query and extract:
-1. **action**: One of:
-   - "navigate" - User wants to go to a specific location, landmark, or a building you can identify by name using your world knowledge (e.g., "take me to Paris", "6th tallest building in the world", "teh eifel tower")
-   - "find_building" - User wants to find a building by characteristics in the CURRENT VIEW only (e.g., "tallest building here", "biggest footprint nearby")
-   - "search_area" - User wants to explore the current area (e.g., "what buildings are here")
-   - "set_weather" - User wants to change weather (e.g., "make it rain", "snow", "clear weather")
-   - "set_time" - User wants to change time of day (e.g., "night mode", "make it dark", "daytime")
-   - "camera_control" - User wants to adjust camera (e.g., "zoom in", "bird's eye", "rotate")
-   - "delete_building" - User wants to remove a building (e.g., "delete the CN Tower")
-   - "question" - User is asking a question about a place (e.g., "how tall is the Burj Khalifa?")
-
-CRITICAL RULES:
-- USE YOUR WORLD KNOWLEDGE. If a user asks for "the Nth tallest building in the world", "the oldest cathedral in Europe", or any factual query, look up the answer from your knowledge and use "navigate" with the specific building/landmark name.
-- ALWAYS correct typos and misspellings. "tke me to Prais" means "take me to Paris". "eifel twoer" means "Eiffel Tower".
-- If the query references a specific named place, famous building, or identifiable landmark, ALWAYS use "navigate" with the resolved name.
-- Only use "find_building" when the user explicitly wants to search the CURRENT viewport (e.g., "tallest here", "biggest around me").
-- For VAGUE or ABSTRACT queries like "take me somewhere with good sunrises", "a beautiful beach", "somewhere cold", "a romantic city" — you MUST still resolve this to a REAL, SPECIFIC location using your world knowledge. Pick the best real-world match. NEVER return null for location_query on a navigate action. Examples: "good sunrises" -> "Santorini, Greece", "beautiful beach" -> "Whitehaven Beach, Australia", "somewhere cold" -> "Tromsø, Norway".
-- location_query must NEVER be null when action is "navigate". Always resolve to a real place.
-
-2. **location_query**: The corrected, resolved location name.
-   - For rankings/facts, resolve to the actual name: "6th tallest building" -> "Goldin Finance 117, Tianjin"
-   - For typos, correct them: "empyre state bilding" -> "Empire State Building, New York"
-   - For landmarks, include city: "CN Tower, Toronto", "Burj Khalifa, Dubai"
-   - If relative ("near here", "in this area"), set to null
-
-3. **building_attributes**: For find_building searches only:
-   - sort_by: "height", "area", "underdeveloped", or null
-   - building_type: "commercial", "residential", "any" (default: "any")
-   - limit: number of results (default: 5)
-
-4. **search_radius_km**: If proximity search mentioned ("within 2km", "nearby" = 1km)
-
-5. **weather_settings**: For set_weather: {"type": "rain|snow|clear"}
-6. **time_settings**: For set_time: {"preset": "day|night"}
-7. **camera_settings**: For camera_control: {"zoom_delta": number, "pitch": number, "bearing_delta": number}
-8. **question_context**: For questions: {"target_name": "building name if mentioned"}
-
-Respond in JSON format:
-{
-    "action": "navigate|find_building|search_area|set_weather|set_time|camera_control|delete_building|question",
-    "location_query": "string or null",
-    "building_attributes": {"sort_by": "height|area|underdeveloped|null", "building_type": "any", "limit": 5},
-    "search_radius_km": number or null,
-    "reasoning": "Brief explanation"
-}
-
-Examples:
-- "take me to the Eiffel Tower" -> {"action": "navigate", "location_query": "Eiffel Tower, Paris", ...}
-- "tke me to prais" -> {"action": "navigate", "location_query": "Paris, France", "reasoning": "Corrected typos: 'tke' -> 'take', 'prais' -> 'Paris'"}
-- "6th tallest building in the world" -> {"action": "navigate", "location_query": "Goldin Finance 117, Tianjin, China", "reasoning": "Goldin Finance 117 (530m) is the 6th tallest building in the world"}
-- "oldest cathedral in europe" -> {"action": "navigate", "location_query": "Cathedral of Trier, Germany", "reasoning": "The Cathedral of Trier is considered the oldest cathedral in Europe"}
-- "tallest building in Toronto" -> {"action": "navigate", "location_query": "CN Tower, Toronto", ...}
-- "tallest building here" -> {"action": "find_building", "location_query": null, "building_attributes": {"sort_by": "height", ...}, "reasoning": "Find tallest in current view"}
-- "make it rain" -> {"action": "set_weather", "weather_settings": {"type": "rain"}, ...}
-- "night mode" -> {"action": "set_time", "time_settings": {"preset": "night"}, ...}
-- "zoom in" -> {"action": "camera_control", "camera_settings": {"zoom_delta": 2}, ...}
-- "delete the cn tower" -> {"action": "delete_building", "location_query": "CN Tower, Toronto", ...}
-- "how tall is big ben" -> {"action": "question", "question_context": {"target_name": "Big Ben, London"}, ...}
-- "take me somewhere with good sunrises" -> {"action": "navigate", "location_query": "Santorini, Greece", "reasoning": "Santorini is world-famous for its sunrises and sunsets"}
-- "a beautiful old city" -> {"action": "navigate", "location_query": "Prague, Czech Republic", "reasoning": "Prague is renowned for its beautiful old-world architecture"}"""
+    EMBEDDING_MODEL = "text-embedding-3-small"
+
+    # Output ceilings sized to the expected response shapes plus headroom, so a
+    # runaway generation can't stretch the decode time. The intent schema
+    # serializes every key (mostly nulls) and question intents carry an answer.
+    CLEAN_PROMPT_MAX_TOKENS = 350
+    INTENT_MAX_TOKENS = 250
+    ANSWER_MAX_TOKENS = 60
+
+    # Intent parsing is on the interactive search path; give up and use the
+    # rule-based fallback rather than stall the request
+    INTENT_TIMEOUT = 5.0
+    # A cache lookup runs ahead of the real call, so it gets only a short wait
+    EMBED_TIMEOUT = 2.0
+
+    # Keywords for the rule-based intent fallback, compiled once per process.
+    # Several entries span words ("go to", "short building"), so they are
+    # matched as one regex per set rather than by intersecting query tokens.
+    _NAV_PHRASES = ("take me to", "go to", "navigate to", "fly to")
+    _BUILDING_SEARCH_WORDS = frozenset({"tallest", "biggest", "underdeveloped"})
+    _HEIGHT_WORDS = frozenset({"tallest", "tall", "highest", "height"})
+    _AREA_WORDS = frozenset({"biggest", "largest", "footprint", "area"})
+    _UNDERDEVELOPED_WORDS = frozenset({"underdeveloped", "low-rise", "short building"})
+
+    _NAV_RE = _keyword_re(_NAV_PHRASES, whole_word=True)
+    _BUILDING_SEARCH_RE = _keyword_re(_BUILDING_SEARCH_WORDS)
+    _HEIGHT_RE = _keyword_re(_HEIGHT_WORDS)
+    _AREA_RE = _keyword_re(_AREA_WORDS)
+    _UNDERDEVELOPED_RE = _keyword_re(_UNDERDEVELOPED_WORDS)
+
+    # Responses sampled above this temperature are too varied to reuse
+    CACHE_MAX_TEMPERATURE = 0.3
+
+    # Redis tier of the response cache (JobStore prefix and TTL in seconds)
+    CACHE_STORE_PREFIX = "llm_cache"
+    CACHE_STORE_TTL = 86400
+
+    SEARCH_INTENT_PROMPT = """You parse map search queries into an intent. Silently fix typos and informal phrasing ("tke me to prais" = "take me to Paris").
+
+Actions (one example each):
+- navigate: go to a named place, or one you can resolve from world knowledge. "6th tallest building in the world" -> "Goldin Finance 117, Tianjin"
+- find_building: rank buildings in the CURRENT VIEW only. "tallest building here" -> sort_by "height"
+- search_area: explore the current view. "what buildings are here"
+- set_weather: "make it rain" -> type "rain"
+- set_time: "night mode" -> preset "night"
+- camera_control: "zoom in" -> zoom_delta 2; "bird's eye" -> pitch 0
+- delete_building: "delete the cn tower" -> location_query "CN Tower, Toronto"
+- question: "how tall is big ben" -> target_name "Big Ben, London", plus answer
+
+Rules:
+- Any named or identifiable place is navigate, never find_building. Use world knowledge for rankings and facts.
+- Vague wishes still resolve to one real place: "somewhere with good sunrises" -> "Santorini, Greece". navigate never has a null location_query.
+- location_query includes the city for landmarks; null only for relative places ("near here").
+- building_attributes: find_building only; building_type "any" and limit 5 unless asked.
+- search_radius_km: only if proximity is mentioned ("nearby" = 1).
+- Settings objects, question_context and answer: only for their action, else null. answer is 1-2 sentences with key facts.
+- reasoning: one short sentence."""
 
     ANSWER_GENERATION_PROMPT = """You are a helpful map assistant. Generate a brief, informative response about the search result.
 
@@ -105,54 +329,167 @@ CRITICAL RULES - MUST FOLLOW:
 - NO TEXT or words in the image
 - 2D ONLY - NOT 3D
 
-Example: "2D flat line art blueprint of a [building],
+Example dalle_prompt: "2D flat line art blueprint of a [building],
 only colored outline strokes, no fill, no 3D, no realistic rendering,
 purple and blue line strokes on white background, technical drawing style,
 vector illustration"
 
-Respond in JSON:
-{
-    "cleaned_prompt": "Simple description",
-    "dalle_prompt": "2D flat line art, blueprint style, only colored outline strokes, "
-                    "no fill, no 3D rendering, no realistic textures, "
-                    "colored lines on white background, technical drawing",
-    "style_tags": ["2D line art", "blueprint", "colored outlines", "flat illustration", "no 3D"]
-}"""
-
-    SYSTEM_PROMPT_3D_PREVIEW = """You are an expert at creating prompts for 3D architectural visualization renders.
-Your job is to take a user's description and create a prompt for a beautiful 3D PERSPECTIVE RENDER of the building.
-
-CRITICAL RULES for the 3D preview prompt:
-- Generate a BEAUTIFUL 3D PERSPECTIVE RENDER - like a professional architectural visualization
-- Show the building from a dramatic 3/4 angle view
-- Use REALISTIC MATERIALS and COLORS - real building materials like glass, steel, brick, concrete
-- Include SOFT NATURAL LIGHTING - golden hour or soft daylight
-- Add SUBTLE SHADOWS for depth and realism
-- Show the building in a MINIMAL CONTEXT - simple ground plane, maybe subtle sky gradient
-- Make it look PHOTOREALISTIC and PROFESSIONAL
-- This is for USER PREVIEW ONLY - to help them visualize the final 3D model
-
-Example format: "Professional 3D architectural render of a [building],
-dramatic 3/4 perspective view, photorealistic materials, soft golden hour lighting,
-subtle shadows, minimal environment, architectural visualization quality"
-
-Respond in JSON format:
-{
-    "preview_prompt": "3D perspective render prompt following the rules above"
-}"""
-
-    def __init__(self):
+cleaned_prompt is a simple description of the building; style_tags are short
+tags like "2D line art", "blueprint", "colored outlines"."""
+
+    # Style contexts live in the system message so every clean_prompt request
+    # shares an identical prefix and only the user prompt varies at the tail.
+    # This keeps the prefix eligible for OpenAI's automatic prompt caching.
+    _STYLE_BLOCK = "\n".join(f"- {name}: {context}" for name, context in STYLE_CONTEXTS.items())
+    CLEAN_PROMPT_SYSTEM = (
+        f"{SYSTEM_PROMPT}\n\n"
+        "The user message starts with [style=<name>]. Apply the matching style context:\n"
+        f"{_STYLE_BLOCK}"
+    )
+
+    # 2D flat line art - blueprint style with colored outlines only, NO 3D rendering
+    _LINE_PREFIX: str = (
+        "2D flat line art, blueprint technical drawing style, "
+        "ONLY colored outline strokes, NO fill colors, NO 3D rendering, "
+        "NO realistic textures, bold purple blue and teal colored lines "
+        "on pure white background, vector illustration style, "
+    )
+
+    # Specific views: front, side, top, isometric - all 2D flat
+    _VIEW_SUFFIXES: tuple[str, ...] = (
+        ", front elevation 2D blueprint",
+        ", side elevation 2D blueprint",
+        ", top down 2D floor plan style",
+        ", isometric 2D technical drawing",
+    )
+    _VIEW_NAMES: tuple[str, ...] = ("front", "side", "top", "isometric")
+
+    # 3D preview render prompt; the building description is substituted directly
+    PREVIEW_PROMPT_TEMPLATE = (
+        "Professional 3D architectural render of {prompt}, "
+        "dramatic 3/4 perspective view, photorealistic materials like glass, steel, brick and concrete, "
+        "soft golden hour lighting, subtle shadows, "
+        "minimal environment with a simple ground plane and subtle sky gradient, "
+        "architectural visualization quality"
+    )
+
+    def __init__(
+        self,
+        prompt_model: Optional[str] = None,
+        intent_model: Optional[str] = None,
+        answer_model: Optional[str] = None
+    ):
         settings = get_settings()
-        if not settings.openai_api_key:
-            self._client = None
-        else:
-            self._client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+        self._client = _get_client()
+        self._prompt_model = prompt_model or settings.openai_prompt_model
+        self._intent_model = intent_model or settings.openai_intent_model
+        self._answer_model = answer_model or settings.openai_answer_model
 
     @property
     def is_configured(self) -> bool:
         """Check if OpenAI is configured."""
         return self._client is not None
 
+    @property
+    def circuit_state(self) -> str:
+        """State of the shared OpenAI circuit breaker."""
+        return _get_circuit_breaker().state
+
+    def _cache_enabled(self, temperature: float) -> bool:
+        """Only deterministic, low-temperature calls are safe to cache."""
+        return get_settings().semantic_cache_enabled and temperature <= self.CACHE_MAX_TEMPERATURE
+
+    async def _embed(self, text: str) -> Optional[list[float]]:
+        """Embed text for semantic cache lookups. Returns None on failure."""
+        if not self._client:
+            return None
+        try:
+            response = await _get_embedding_breaker().call(
+                self._client.embeddings.create,
+                timeout=self.EMBED_TIMEOUT,
+                model=self.EMBEDDING_MODEL,
+                input=text
+            )
+            return response.data[0].embedding
+        except Exception:
+            return None
+
+    async def _cache_lookup(
+        self, namespace: str, text: str, similar: bool = True
+    ) -> tuple[Optional[dict], Optional[list[float]]]:
+        """
+        Check the response caches: in-process exact match, then Redis (shared
+        across workers), then in-process embedding similarity.
+
+        Args:
+            namespace: Cache namespace
+            text: Input to look up
+            similar: False skips the similarity tier (and its embedding call)
+                for namespaces where near-duplicate inputs can mean different things
+
+        Returns:
+            Tuple of (cached value or None, embedding to store on a miss)
+        """
+        cache = get_semantic_cache()
+        cached = cache.get_exact(namespace, text)
+        if cached is not None:
+            return cached, None
+
+        store = get_job_store()
+        if store.is_redis:
+            try:
+                cached = await store.get(self.CACHE_STORE_PREFIX, self._cache_store_key(namespace, text))
+            except Exception:
+                cached = None  # The cache is best-effort; a Redis error is just a miss
+            if cached is not None:
+                cache.set(namespace, text, cached)
+                return cached, None
+
+        if not similar:
+            return None, None
+
+        embedding = await self._embed(text)
+        if embedding is not None:
+            cached = cache.get_similar(namespace, embedding)
+            if cached is not None:
+                # Promote near-duplicates to exact hits for next time
+                cache.set(namespace, text, cached)
+        return cached, embedding
+
+    async def _cache_store(
+        self,
+        namespace: str,
+        text: str,
+        value: dict,
+        embedding: Optional[list[float]]
+    ) -> None:
+        """Store a response in the in-process cache and, if available, Redis."""
+        get_semantic_cache().set(namespace, text, value, embedding)
+        store = get_job_store()
+        if store.is_redis:
+            try:
+                await store.set(
+                    self.CACHE_STORE_PREFIX,
+                    self._cache_store_key(namespace, text),
+                    value,
+                    self.CACHE_STORE_TTL,
+                    index=False  # Never listed; keep it out of the prefix index
+                )
+            except Exception:
+                pass
+
+    @staticmethod
+    def _cache_store_key(namespace: str, text: str) -> str:
+        return hashlib.sha256(f"{namespace}|{normalize_text(text)}".encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _parsed(response: ParsedChatCompletion[ParsedT]) -> ParsedT:
+        """Get the schema-validated output of a parse() call."""
+        message = response.choices[0].message
+        if message.parsed is None:
+            raise RuntimeError(message.refusal or "No content in OpenAI response")
+        return message.parsed
+
     async def clean_prompt(
         self,
         prompt: str,
@@ -171,29 +508,38 @@ Respond in JSON format:
         if not self._client:
             raise RuntimeError("OpenAI not configured. Set OPENAI_API_KEY.")
 
-        style_context = self.STYLE_CONTEXTS.get(style, self.STYLE_CONTEXTS["architectural"])
-
-        response = await self._client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": self.SYSTEM_PROMPT},
-                {"role": "user", "content": f"Style preference: {style_context}\n\nUser prompt: {prompt}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.3,  # Lower temperature for consistent bright outputs
-            max_tokens=500
-        )
-
-        content = response.choices[0].message.content
-        if content is None:
-            raise RuntimeError("No content in OpenAI response")
-        result = json.loads(content)
+        if style not in self.STYLE_CONTEXTS:
+            style = "architectural"
+        temperature = 0.3  # Lower temperature for consistent bright outputs
+
+        use_cache = self._cache_enabled(temperature)
+        cache_namespace = f"clean_prompt:{style}"
+        result: Optional[dict] = None
+        if use_cache:
+            # Exact tiers only: "a red brick tower" and "a blue brick tower" embed
+            # above the similarity threshold but must not share a cleaned prompt
+            result, _ = await self._cache_lookup(cache_namespace, prompt, similar=False)
+
+        if result is None:
+            response = await self._client.beta.chat.completions.parse(
+                model=self._prompt_model,
+                messages=[
+                    {"role": "system", "content": self.CLEAN_PROMPT_SYSTEM},
+                    {"role": "user", "content": f"[style={style}] {prompt}"}
+                ],
+                response_format=CleanedPrompt,
+                temperature=temperature,
+                max_tokens=self.CLEAN_PROMPT_MAX_TOKENS
+            )
+            result = self._parsed(response).model_dump()
+            if use_cache:
+                await self._cache_store(cache_namespace, prompt, result, None)
 
         return PromptCleanResponse(
             original_prompt=prompt,
-            cleaned_prompt=result.get("cleaned_prompt", prompt),
-            dalle_prompt=result.get("dalle_prompt", prompt),
-            style_tags=result.get("style_tags", [])
+            cleaned_prompt=result["cleaned_prompt"],
+            dalle_prompt=result["dalle_prompt"],
+            style_tags=result["style_tags"]
         )
 
     async def generate_images(
@@ -217,67 +563,150 @@ Respond in JSON format:
             include_3d_preview: Whether to also generate a 3D preview render
 
         Returns:
-            ImageGenerateResponse with image URLs and optional 3D preview
+            ImageGenerateResponse with image URLs and optional 3D preview. Views
+            that fail are left out of images and named in failed_views; only
+            all views failing raises.
         """
         if not self._client:
             raise RuntimeError("OpenAI not configured. Set OPENAI_API_KEY.")
 
-        # 2D flat line art - blueprint style with colored outlines only, NO 3D rendering
-        line_prefix = (
-            "2D flat line art, blueprint technical drawing style, "
-            "ONLY colored outline strokes, NO fill colors, NO 3D rendering, "
-            "NO realistic textures, bold purple blue and teal colored lines "
-            "on pure white background, vector illustration style, "
-        )
-        line_prompt = f"{line_prefix}{prompt}"
-
-        # Specific views: front, side, top, isometric - all 2D flat
-        view_prompts = [
-            f"{line_prompt}, front elevation 2D blueprint",
-            f"{line_prefix}{prompt}, side elevation 2D blueprint",
-            f"{line_prefix}{prompt}, top down 2D floor plan style",
-            f"{line_prefix}{prompt}, isometric 2D technical drawing"
-        ][:num_images]
-
-        # Generate all images in parallel instead of sequentially
-        async def generate_single_image(view_prompt: str):
-            # Cast size and quality to satisfy OpenAI API type requirements
-            size_param = cast(
-                Literal["1024x1024", "1792x1024", "1024x1792"],
-                size
-            )
-            quality_param = cast(Literal["standard", "hd"], quality)
-            style_param = cast(Literal["natural", "vivid"], style)
+        view_prompts = self._view_prompts(prompt, num_images)
 
-            if not self._client:
-                raise RuntimeError("OpenAI client not configured")
-            response = await self._client.images.generate(
-                model="dall-e-3",
-                prompt=view_prompt,
-                size=size_param,
-                quality=quality_param,
-                style=style_param,
-                n=1
-            )
-            return response.data[0].url
+        # Start the 3D preview (separate from the flat elevation images) first so
+        # its DALL-E call overlaps the elevations instead of following them
+        preview_task: Optional[asyncio.Task[Optional[str]]] = None
+        if include_3d_preview:
+            preview_task = asyncio.create_task(self._generate_3d_preview(prompt, size, quality))
 
-        # Run all image generations concurrently
+        # Run all image generations concurrently; one failed view doesn't sink the batch
         image_results = await asyncio.gather(
-            *[generate_single_image(p) for p in view_prompts]
+            *[self._generate_single_image(p, size, quality, style) for p in view_prompts],
+            return_exceptions=True
         )
-        # Type assertion: we know all URLs are strings
-        images: list[str] = cast(list[str], list(image_results))
+        images: list[str] = []
+        failed_views: list[str] = []
+        for view, result in zip(self._VIEW_NAMES, image_results):
+            if isinstance(result, str):
+                images.append(result)
+                continue
+            failed_views.append(view)
+            if isinstance(result, BaseException):
+                logger.warning(
+                    "DALL-E %s view failed", view,
+                    exc_info=(type(result), result, result.__traceback__)
+                )
+            else:
+                logger.warning("DALL-E %s view returned no image URL", view)
+        if not images:
+            if preview_task:
+                preview_task.cancel()
+            errors = [r for r in image_results if isinstance(r, BaseException)]
+            if errors:
+                raise errors[0]
+            raise RuntimeError("No image URLs in DALL-E response")
 
-        # Generate 3D preview image (separate from the flat elevation images)
-        preview_3d_url: Optional[str] = None
-        if include_3d_preview:
-            preview_3d_url = await self._generate_3d_preview(prompt, size, quality)
+        preview_3d_url = await preview_task if preview_task else None
 
         return ImageGenerateResponse(
             images=images,
             prompt_used=prompt,
-            preview_3d_url=preview_3d_url
+            preview_3d_url=preview_3d_url,
+            failed_views=failed_views
+        )
+
+    async def generate_images_stream(
+        self,
+        prompt: str,
+        num_images: int = 1,
+        size: str = "1024x1024",
+        quality: str = "hd",
+        style: str = "natural"
+    ) -> AsyncIterator[dict]:
+        """
+        Generate architectural views with DALL-E 3, yielding each as it completes.
+
+        Args:
+            prompt: Optimized DALL-E prompt
+            num_images: Number of views to generate (1-4)
+            size: Image size
+            quality: standard or hd
+            style: natural or vivid
+
+        Yields:
+            {"index": i, "url": url} per finished view, or
+            {"index": i, "error": message} if that view failed
+        """
+        if not self._client:
+            raise RuntimeError("OpenAI not configured. Set OPENAI_API_KEY.")
+
+        async def generate_view(index: int, view_prompt: str) -> dict:
+            try:
+                url = await self._generate_single_image(view_prompt, size, quality, style)
+            except Exception as e:
+                logger.warning("DALL-E %s view failed", self._VIEW_NAMES[index], exc_info=True)
+                return {"index": index, "error": str(e)}
+            if url is None:
+                return {"index": index, "error": "No image URL in DALL-E response"}
+            return {"index": index, "url": url}
+
+        tasks = [
+            asyncio.create_task(generate_view(i, p))
+            for i, p in enumerate(self._view_prompts(prompt, num_images))
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding generations if the consumer goes away early
+            for task in tasks:
+                task.cancel()
+
+    def _view_prompts(self, prompt: str, num_images: int) -> list[str]:
+        """Build the per-view DALL-E prompts for a building description."""
+        line_prompt = f"{self._LINE_PREFIX}{prompt}"
+        return [line_prompt + suffix for suffix in self._VIEW_SUFFIXES[:num_images]]
+
+    @retry(
+        retry=retry_if_exception_type((openai.RateLimitError, openai.APIConnectionError)),
+        wait=wait_exponential(multiplier=1, max=30),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+    async def _generate_single_image(
+        self,
+        prompt: str,
+        size: str,
+        quality: str,
+        style: str
+    ) -> Optional[str]:
+        """
+        Generate one DALL-E 3 image, throttled to the configured RPM and
+        concurrency limits. Retries with exponential backoff on rate limits
+        and connection errors.
+        """
+        if not self._client:
+            raise RuntimeError("OpenAI client not configured")
+
+        # Cast size and quality to satisfy OpenAI API type requirements
+        size_param = cast(
+            Literal["1024x1024", "1792x1024", "1024x1792"],
+            size
         )
+        quality_param = cast(Literal["standard", "hd"], quality)
+        style_param = cast(Literal["natural", "vivid"], style)
+
+        async with _get_image_semaphore():
+            await _get_image_rate_limiter().acquire()
+            # Retries are handled above so every attempt goes through the limiter
+            response = await self._client.with_options(max_retries=0).images.generate(
+                model="dall-e-3",
+                prompt=prompt,
+                size=size_param,
+                quality=quality_param,
+                style=style_param,
+                n=1
+            )
+        return response.data[0].url
 
     async def _generate_3d_preview(
         self,
@@ -300,44 +729,11 @@ Respond in JSON format:
         if not self._client:
             raise RuntimeError("OpenAI not configured. Set OPENAI_API_KEY.")
 
-        try:
-            # Get optimized 3D preview prompt from GPT
-            gpt_response = await self._client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": self.SYSTEM_PROMPT_3D_PREVIEW},
-                    {"role": "user", "content": f"Create a 3D preview prompt for: {prompt}"}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.5,
-                max_tokens=300
-            )
-
-            content = gpt_response.choices[0].message.content
-            if content is None:
-                raise RuntimeError("No content in OpenAI response")
-            result = json.loads(content)
-            default_preview = (
-                f"Professional 3D architectural render of {prompt}, "
-                "dramatic perspective view, photorealistic"
-            )
-            preview_prompt = result.get("preview_prompt", default_preview)
+        preview_prompt = self.PREVIEW_PROMPT_TEMPLATE.format(prompt=prompt.strip().rstrip("."))
 
-            # Generate the 3D preview image
-            size_param = cast(
-                Literal["1024x1024", "1792x1024", "1024x1792"],
-                size
-            )
-            quality_param = cast(Literal["standard", "hd"], quality)
-            response = await self._client.images.generate(
-                model="dall-e-3",
-                prompt=preview_prompt,
-                size=size_param,
-                quality=quality_param,
-                style="vivid",  # Use vivid for more dramatic 3D renders
-                n=1
-            )
-            return response.data[0].url
+        try:
+            # Generate the 3D preview image (vivid for more dramatic 3D renders)
+            return await self._generate_single_image(preview_prompt, size, quality, "vivid")
         except Exception:
             return None
 
@@ -349,59 +745,77 @@ Respond in JSON format:
             query: User's search query (e.g., "take me to Paris", "tallest building")
 
         Returns:
-            Dict with action, location_query, building_attributes, search_radius_km
+            Dict with action, location_query, building_attributes, search_radius_km.
+            For "question" actions it also carries the answer, so no second
+            OpenAI round trip is needed.
         """
         if not self._client:
             # Fallback to simple keyword parsing if OpenAI not configured
             return self._fallback_intent_parse(query)
 
+        temperature = 0.3  # Lower for more deterministic parsing
+        use_cache = self._cache_enabled(temperature)
+        if use_cache:
+            # Exact tiers only: near-duplicate queries like "tallest building" and
+            # "shortest building" embed close together but need opposite intents
+            cached, _ = await self._cache_lookup("search_intent", query, similar=False)
+            if cached is not None:
+                return dict(cached)
+
         try:
-            response = await self._client.chat.completions.create(
-                model="gpt-4o",
+            response = await _get_circuit_breaker().call(
+                self._client.beta.chat.completions.parse,
+                timeout=self.INTENT_TIMEOUT,
+                model=self._intent_model,
                 messages=[
                     {"role": "system", "content": self.SEARCH_INTENT_PROMPT},
                     {"role": "user", "content": f"Parse this search query: {query}"}
                 ],
-                response_format={"type": "json_object"},
-                temperature=0.3,  # Lower for more deterministic parsing
-                max_tokens=300
+                response_format=SearchIntent,
+                temperature=temperature,
+                max_tokens=self.INTENT_MAX_TOKENS
             )
-
-            content = response.choices[0].message.content
-            if content is None:
-                raise RuntimeError("No content in OpenAI response")
-            return json.loads(content)
+            intent = self._parsed(response).model_dump()
+            if use_cache:
+                await self._cache_store("search_intent", query, intent, None)
+            return dict(intent)
         except Exception:
             return self._fallback_intent_parse(query)
 
     def _fallback_intent_parse(self, query: str) -> dict:
         """Fallback rule-based intent parsing when OpenAI is unavailable."""
-        query_lower = query.lower()
-
+        # Copy so callers never mutate the memoized result
+        intent = dict(self._fallback_intent_for(query.lower()))
+        if intent["building_attributes"]:
+            intent["building_attributes"] = dict(intent["building_attributes"])
+        return intent
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _fallback_intent_for(cls, query_lower: str) -> dict:
+        """Rule-based intent for a lowercased query, memoized across requests."""
         # Check for navigation intent
-        if any(phrase in query_lower for phrase in ["take me to", "go to", "navigate to", "fly to"]):
+        nav_match = cls._NAV_RE.search(query_lower)
+        if nav_match:
             # Extract location after the phrase
-            for phrase in ["take me to", "go to", "navigate to", "fly to"]:
-                if phrase in query_lower:
-                    location = query_lower.split(phrase, 1)[1].strip()
-                    # Check if it's a building search
-                    if any(word in location for word in ["tallest", "biggest", "underdeveloped"]):
-                        break  # It's a building search, not navigation
-                    return {
-                        "action": "navigate",
-                        "location_query": location,
-                        "building_attributes": None,
-                        "search_radius_km": None,
-                        "reasoning": "Fallback: navigation phrase detected"
-                    }
+            location = query_lower[nav_match.end():].strip()
+            # Building searches ("take me to the tallest...") aren't navigation
+            if not cls._BUILDING_SEARCH_RE.search(location):
+                return {
+                    "action": "navigate",
+                    "location_query": location,
+                    "building_attributes": None,
+                    "search_radius_km": None,
+                    "reasoning": "Fallback: navigation phrase detected"
+                }
 
         # Check for building search
         sort_by = None
-        if any(word in query_lower for word in ["tallest", "tall", "highest", "height"]):
+        if cls._HEIGHT_RE.search(query_lower):
             sort_by = "height"
-        elif any(word in query_lower for word in ["biggest", "largest", "footprint", "area"]):
+        elif cls._AREA_RE.search(query_lower):
             sort_by = "area"
-        elif any(word in query_lower for word in ["underdeveloped", "low-rise", "short building"]):
+        elif cls._UNDERDEVELOPED_RE.search(query_lower):
             sort_by = "underdeveloped"
 
         if sort_by:
@@ -445,23 +859,12 @@ Respond in JSON format:
             return self._fallback_answer_generation(query, top_result, location_name, intent)
 
         try:
-            if not top_result:
-                context = f"Query: {query}\nLocation: {location_name or 'current viewport'}\nResult: No buildings found."
-            else:
-                props = top_result.get("properties", {})
-                context = f"""Query: {query}
-Location: {location_name or 'current viewport'}
-Top result properties: {json.dumps(props, indent=2)}
-Intent: {json.dumps(intent) if intent else 'unknown'}"""
-
-            response = await self._client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": self.ANSWER_GENERATION_PROMPT},
-                    {"role": "user", "content": context}
-                ],
+            response = await _get_circuit_breaker().call(
+                self._client.chat.completions.create,
+                model=self._answer_model,
+                messages=self._answer_messages(query, top_result, location_name, intent),
                 temperature=0.7,
-                max_tokens=100
+                max_tokens=self.ANSWER_MAX_TOKENS
             )
 
             content = response.choices[0].message.content
@@ -469,6 +872,72 @@ Intent: {json.dumps(intent) if intent else 'unknown'}"""
         except Exception:
             return self._fallback_answer_generation(query, top_result, location_name, intent)
 
+    async def generate_search_answer_stream(
+        self,
+        query: str,
+        top_result: Optional[dict],
+        location_name: Optional[str],
+        intent: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a natural language answer for search results as it is generated.
+
+        Args:
+            query: Original search query
+            top_result: Top building result (GeoJSON feature) or None
+            location_name: Location context if applicable
+            intent: Parsed intent for context
+
+        Yields:
+            Answer text fragments; the fallback answer in one piece if OpenAI fails
+            before anything was produced
+        """
+        if not self._client:
+            yield self._fallback_answer_generation(query, top_result, location_name, intent)
+            return
+
+        produced = False
+        try:
+            stream = await _get_circuit_breaker().call(
+                self._client.chat.completions.create,
+                model=self._answer_model,
+                messages=self._answer_messages(query, top_result, location_name, intent),
+                temperature=0.7,
+                max_tokens=self.ANSWER_MAX_TOKENS,
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    produced = True
+                    yield delta
+        except Exception:
+            # Once text has gone out a fallback would read as a second answer
+            if not produced:
+                yield self._fallback_answer_generation(query, top_result, location_name, intent)
+
+    def _answer_messages(
+        self,
+        query: str,
+        top_result: Optional[dict],
+        location_name: Optional[str],
+        intent: Optional[dict]
+    ) -> list[ChatCompletionMessageParam]:
+        """Build the answer generation chat messages for a search result."""
+        if not top_result:
+            context = f"Query: {query}\nLocation: {location_name or 'current viewport'}\nResult: No buildings found."
+        else:
+            props = top_result.get("properties", {})
+            context = f"""Query: {query}
+Location: {location_name or 'current viewport'}
+Top result properties: {orjson.dumps(props).decode()}
+Intent: {orjson.dumps(intent).decode() if intent else 'unknown'}"""
+
+        return [
+            {"role": "system", "content": self.ANSWER_GENERATION_PROMPT},
+            {"role": "user", "content": context}
+        ]
+
     def _fallback_answer_generation(
         self,
         _: str,
@@ -478,15 +947,29 @@ Intent: {json.dumps(intent) if intent else 'unknown'}"""
     ) -> str:
         """Fallback answer generation when OpenAI is unavailable."""
         if not top_result:
-            return f"No buildings found{' near ' + location_name if location_name else ' in this area'}."
+            return self._fallback_answer_for(None, None, None, location_name)
 
         props = top_result.get("properties", {})
         name = props.get("name") or props.get("addr:housename") or props.get("addr:housenumber") or "this building"
 
-        sort_by = intent.get("building_attributes", {}).get("sort_by") if intent else None
+        sort_by = (intent.get("building_attributes") or {}).get("sort_by") if intent else None
+        height = props.get("height", props.get("building:levels", "unknown")) if sort_by == "height" else None
+
+        return self._fallback_answer_for(sort_by, str(name), None if height is None else str(height), location_name)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _fallback_answer_for(
+        sort_by: Optional[str],
+        name: Optional[str],
+        height: Optional[str],
+        location_name: Optional[str]
+    ) -> str:
+        """Fallback answer text keyed on the fields it depends on, memoized."""
+        if name is None:
+            return f"No buildings found{' near ' + location_name if location_name else ' in this area'}."
 
         if sort_by == "height":
-            height = props.get("height", props.get("building:levels", "unknown"))
             return f"The tallest building is {name} ({height})."
         elif sort_by == "area":
             return f"The building with the largest footprint is {name}."
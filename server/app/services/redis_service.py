@@ -1,9 +1,14 @@
-import json
+import logging
+import time
 from typing import Optional, Any, cast
+import orjson
 import redis
+from redis import asyncio as aioredis
 
 from ..config import get_settings
 
+logger = logging.getLogger(__name__)
+
 
 class JobStore:
     """
@@ -11,87 +16,143 @@ class JobStore:
     Handles JSON serialization automatically.
     """
 
+    # Short-lived local copy of Redis reads so bursts of status polling on the
+    # same job don't each pay a round trip. Writes from this process evict it.
+    LOCAL_CACHE_TTL = 0.25  # seconds
+    LOCAL_CACHE_MAX_ENTRIES = 4096
+
     def __init__(self):
-        self._redis: Optional[redis.Redis] = None  # type: ignore[type-arg]
+        self._redis: Optional[aioredis.Redis] = None  # type: ignore[type-arg]
         self._memory: dict[str, dict[str, Any]] = {}  # Fallback storage
-        self._connect()
-
+        self._local: dict[str, tuple[float, dict[str, Any]]] = {}  # key -> (expires_at, value)
 
-    def _connect(self):
-        """Try to connect to Redis."""
+    async def connect(self) -> None:
+        """Try to connect to Redis. Called once from the app lifespan."""
         settings = get_settings()
         if settings.redis_url:
+            pool = aioredis.ConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=50,
+                socket_connect_timeout=5
+            )
+            redis_client: aioredis.Redis = aioredis.Redis(connection_pool=pool)  # type: ignore[type-arg]
             try:
-                redis_client: redis.Redis = redis.from_url(  # type: ignore[type-arg]
-                    settings.redis_url,
-                    decode_responses=True,
-                    socket_connect_timeout=5
-                )
                 # Test connection
-                redis_client.ping()  # type: ignore[union-attr]
+                await redis_client.ping()  # type: ignore[union-attr]
                 self._redis = redis_client
-                print("✓ Connected to Redis")
+                logger.info("Connected to Redis")
             except (redis.ConnectionError, redis.TimeoutError) as e:
-                print(f"✗ Redis connection failed: {e}")
-                print("  Falling back to in-memory storage")
+                logger.warning("Redis connection failed, falling back to in-memory storage: %s", e)
+                await redis_client.aclose()
                 self._redis = None
         else:
-            print("  No REDIS_URL set - using in-memory storage")
+            logger.info("No REDIS_URL set - using in-memory storage")
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self._redis:
+            await self._redis.aclose()
+            self._redis = None
+
+    @staticmethod
+    def _index_key(prefix: str) -> str:
+        """Redis SET holding the job keys stored under a prefix."""
+        return f"{prefix}:_index"
 
     @property
     def is_redis(self) -> bool:
         """Check if using Redis."""
         return self._redis is not None
 
-    def set(
-        self, prefix: str, key: str, value: dict[str, Any], ttl: int = 3600
+    async def set(
+        self,
+        prefix: str,
+        key: str,
+        value: dict[str, Any],
+        ttl: int = 3600,
+        index: bool = True
     ) -> None:
         """
         Store a job. TTL is in seconds (default 1 hour).
+        Pass index=False for entries never listed with get_all (e.g. caches),
+        so the prefix index doesn't grow with them.
         """
         full_key = f"{prefix}:{key}"
-        json_value = json.dumps(value)
+        json_value = orjson.dumps(value)
 
         if self._redis:
-            self._redis.setex(full_key, ttl, json_value)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.setex(full_key, ttl, json_value)
+            if index:
+                # Track the key in the prefix index in the same round trip.
+                # Indexed callers share one TTL per prefix, so refreshing it
+                # keeps the index alive at least as long as its newest key.
+                index_key = self._index_key(prefix)
+                pipe.sadd(index_key, key)
+                pipe.expire(index_key, ttl)
+            await pipe.execute()
+            self._local.pop(full_key, None)
         else:
             self._memory[full_key] = value
 
-    def get(self, prefix: str, key: str) -> Optional[dict[str, Any]]:
+    async def get(self, prefix: str, key: str) -> Optional[dict[str, Any]]:
         """Retrieve a job."""
         full_key = f"{prefix}:{key}"
 
         if self._redis:
-            data = self._redis.get(full_key)
-            if data is not None:
-                # Redis with decode_responses=True returns str
-                return json.loads(cast(str, data))
-            return None
+            now = time.monotonic()
+            cached = self._local.get(full_key)
+            if cached is not None and cached[0] > now:
+                # Copy so callers can't mutate the cached value
+                return dict(cached[1])
+
+            data = await self._redis.get(full_key)
+            if data is None:
+                self._local.pop(full_key, None)
+                return None
+            # Raw bytes go straight to orjson, no str decoding step
+            value = orjson.loads(cast(bytes, data))
+            if len(self._local) >= self.LOCAL_CACHE_MAX_ENTRIES:
+                self._local = {k: v for k, v in self._local.items() if v[0] > now}
+                if len(self._local) >= self.LOCAL_CACHE_MAX_ENTRIES:
+                    self._local.pop(next(iter(self._local)))
+            self._local[full_key] = (now + self.LOCAL_CACHE_TTL, value)
+            return dict(value)
         else:
             return self._memory.get(full_key)
 
-    def delete(self, prefix: str, key: str) -> None:
+    async def delete(self, prefix: str, key: str) -> None:
         """Delete a job."""
         full_key = f"{prefix}:{key}"
 
         if self._redis:
-            self._redis.delete(full_key)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.delete(full_key)
+            pipe.srem(self._index_key(prefix), key)
+            await pipe.execute()
+            self._local.pop(full_key, None)
         else:
             self._memory.pop(full_key, None)
 
-    def get_all(self, prefix: str) -> list[dict[str, Any]]:
-        """Get all jobs with a given prefix."""
+    async def get_all(self, prefix: str) -> list[dict[str, Any]]:
+        """Get all jobs with a given prefix (only those stored with index=True)."""
         if self._redis:
-            # Redis with decode_responses=True returns list[str]
-            key_list = cast(list[str], self._redis.keys(f"{prefix}:*"))
-            jobs: list[dict[str, Any]] = []
-            for key in key_list:
-                data = self._redis.get(key)
-                if data is not None:
-                    # Redis with decode_responses=True returns str
-                    job: dict[str, Any] = json.loads(cast(str, data))
-                    jobs.append(job)
-            return jobs
+            # Read the prefix index instead of scanning the whole keyspace,
+            # then fetch every value in a single MGET round trip
+            index_key = self._index_key(prefix)
+            members = cast(set[bytes], await self._redis.smembers(index_key))
+            if not members:
+                return []
+            keys = [member.decode() for member in members]
+            values = cast(
+                list[Optional[bytes]],
+                await self._redis.mget([f"{prefix}:{k}" for k in keys])
+            )
+            # Index entries outlive keys that expired on their own; prune them lazily
+            stale = [k for k, data in zip(keys, values) if data is None]
+            if stale:
+                await self._redis.srem(index_key, *stale)
+            return [orjson.loads(data) for data in values if data is not None]
         else:
             return [
                 v for k, v in self._memory.items()
@@ -99,13 +160,11 @@ class JobStore:
             ]
 
 
-# Global instance
-_job_store: Optional[JobStore] = None
+# Global instance, created at import so concurrent first callers share it.
+# The constructor does no I/O; Redis is connected from the app lifespan.
+_job_store = JobStore()
 
 
 def get_job_store() -> JobStore:
     """Get the global job store instance."""
-    global _job_store
-    if _job_store is None:
-        _job_store = JobStore()
     return _job_store
@@ -1,17 +1,30 @@
+import logging
 import uvicorn
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings, init_directories
+from app.middleware import ContentLengthLimitMiddleware, SelectiveGZipMiddleware
 from app.routes import generation_router, files_router, health_router, search_router
-from app.services import OpenAIService, FalService
+from app.services import (
+    OpenAIService,
+    FalService,
+    close_http_sessions,
+    close_openai_client,
+    get_job_store,
+)
 
-# Initialize directories on startup
+# Initialize directories and storage on startup, release pooled connections on shutdown
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     init_directories()
+    await get_job_store().connect()
     yield
+    await get_job_store().close()
+    await close_openai_client()
+    await close_http_sessions()
 
 # Initialize app
 app = FastAPI(
@@ -20,19 +33,36 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,  # orjson render instead of stdlib json
     lifespan=lifespan
 )
 
-# Configure CORS
 settings = get_settings()
+
+# Configure logging once so LOG_LEVEL can quiet service logs in production
+logging.basicConfig(
+    level=settings.log_level.upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+
+# Reject oversize uploads from their Content-Length, before the body is read.
+# Added before CORS so the 413 still carries CORS headers.
+app.add_middleware(ContentLengthLimitMiddleware, max_bytes=settings.max_upload_bytes)
+
+# Configure CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists (not "*") so browsers can cache preflights for max_age
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Content-Type"],
+    max_age=86400,
 )
 
+# Compress JSON responses (search GeoJSON, job lists); level 6 keeps CPU cost low
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000, compresslevel=6)
+
 # Include routers
 app.include_router(health_router)
 app.include_router(generation_router)
@@ -56,5 +86,8 @@ if __name__ == "__main__":
         "server:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.debug
+        reload=settings.debug,
+        workers=1 if settings.debug else settings.workers,  # reload needs a single process
+        loop="uvloop",
+        http="httptools"
     )